@@ -5,7 +5,7 @@ Features:
  - Clarifying questions
  - Multi-round debate (streamed)
  - Final business analyst summary
- - Market Analyst using Tavily (RAG) — runs AFTER final summary
+ - Market Analyst using Tavily (RAG) — runs alongside the final summary
  - Investor Bot — structured numeric sub-scores + verdict + recommendations
  - Save to MongoDB and archive view
 """
@@ -13,15 +13,23 @@ Features:
 import os
 import re
 import datetime
+import hashlib
+import queue
+import threading
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 import streamlit as st
-from pymongo import MongoClient, DESCENDING
+from pymongo import MongoClient, DESCENDING, InsertOne, UpdateOne
 from pymongo.server_api import ServerApi
-
-# Optional: Gemini (Google generative AI) — keep to match your original setup
-import google.generativeai as genai
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import OperationFailure
+from bson import ObjectId
 
 # ---------------------------
 # Load environment variables
@@ -30,6 +38,11 @@ load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 MONGO_CONNECTION_STRING = os.getenv("MONGO_CONNECTION_STRING")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+# archive writes use w=1 without journal acknowledgement; set to "false" where durability matters
+MONGO_FAST_WRITES = os.getenv("MONGO_FAST_WRITES", "true").lower() in ("1", "true", "yes")
+
+# numbered-list line of clarifying questions ("1. <question>"); captures the question text only
+_QLINE_RE = re.compile(r"^\s*\d+\.\s*(.+?)\s*$", re.MULTILINE)
 
 # ---------------------------
 # Page config
@@ -39,110 +52,402 @@ st.set_page_config(page_title="IdeaCritic", page_icon="🚀", layout="wide")
 # ---------------------------
 # Helpers: initialize Gemini
 # ---------------------------
-@st.cache_resource
+@st.cache_resource(max_entries=1, validate=lambda model: model is not None)
 def init_gemini():
     if not GOOGLE_API_KEY:
         st.error("GOOGLE_API_KEY missing in .env. Add your Gemini API key.")
         st.stop()
     try:
+        # imported lazily: the History page never needs the Gemini SDK
+        import google.generativeai as genai
         genai.configure(api_key=GOOGLE_API_KEY)
         # model selection — keep same name you used earlier; change if needed
-        return genai.GenerativeModel("gemini-2.5-flash")
+        model = genai.GenerativeModel("gemini-2.5-flash")
     except Exception as e:
         st.error(f"Failed to configure Gemini: {e}")
         st.stop()
+    try:
+        # one-token warm-up call so the gRPC channel + TLS handshake happen before the first user request
+        model.generate_content("ping", generation_config={"max_output_tokens": 1})
+    except Exception:
+        # warm-up is best-effort; real calls report their own errors
+        pass
+    return model
 
 # ---------------------------
 # Helpers: initialize Mongo
 # ---------------------------
-@st.cache_resource
+@st.cache_resource(max_entries=1, validate=lambda client: client is not None)
 def init_mongo():
     if not MONGO_CONNECTION_STRING:
         st.error("MONGO_CONNECTION_STRING missing in .env. Add your Mongo URI.")
         st.stop()
     try:
-        client = MongoClient(MONGO_CONNECTION_STRING, server_api=ServerApi("1"))
-        client.admin.command("ping")
-        return client
+        # no blocking ping: PyMongo connects lazily and the first real query surfaces failures
+        return MongoClient(
+            MONGO_CONNECTION_STRING,
+            server_api=ServerApi("1"),
+            maxPoolSize=50,
+            minPoolSize=5,
+            # wire compression for transcript writes / archive reads; the server picks the first it supports
+            compressors="zstd,zlib",
+            socketTimeoutMS=10000
+        )
     except Exception as e:
         st.error(f"Failed to connect to MongoDB: {e}")
         st.stop()
 
-# instantiate resources
-gemini_model = init_gemini()
+# ---------------------------
+# Helpers: pooled HTTP session for Tavily
+# ---------------------------
+@st.cache_resource
+def get_http_session():
+    """
+    Shared requests.Session so Tavily calls reuse keep-alive TCP/TLS connections
+    instead of paying a fresh handshake on every cache miss.
+    """
+    session = requests.Session()
+    session.headers.update({"Authorization": f"Bearer {TAVILY_API_KEY}"})
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount("https://", adapter)
+    return session
+
+# ---------------------------
+# Helpers: background executor
+# ---------------------------
+@st.cache_resource
+def get_background_executor():
+    """
+    Process-wide thread pool for I/O that can overlap the debate (e.g. Tavily prefetch).
+    """
+    return ThreadPoolExecutor(max_workers=4)
+
+@st.cache_resource
+def get_db_writer():
+    """
+    Single-worker pool for fire-and-forget archive writes; one worker keeps writes in submission order.
+    """
+    return ThreadPoolExecutor(max_workers=1)
+
+def flush_pending_writes(collection, pending: queue.Queue):
+    """
+    Send every op queued in `pending` with one ordered bulk_write (runs on the DB writer).
+    Ops that pile up while an earlier write is in flight go out together in a single round-trip.
+    """
+    ops = []
+    while True:
+        try:
+            ops.append(pending.get_nowait())
+        except queue.Empty:
+            break
+    if ops:
+        collection.bulk_write(ops, ordered=True)
+
+# instantiate resources (Gemini is initialized lazily on first use via init_gemini())
 mongo_client = init_mongo()
+
 db = mongo_client["ideacritic_db"]
 debates_collection = db["debates"]
+debates_writes = (
+    debates_collection.with_options(write_concern=WriteConcern(w=1, j=False))
+    if MONGO_FAST_WRITES else debates_collection
+)
 market_cache = db["market_cache"]
 
+# cache entries expire after this many seconds (Mongo TTL monitor removes them)
+MARKET_CACHE_TTL_SECONDS = 86400
+
+def market_cache_key(query: str) -> str:
+    # queries embed the whole idea context (often several KB), so index a fixed-size digest instead
+    return hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+
+def create_indexes():
+    """
+    Create the indexes the app relies on (idempotent).
+    Returns an error message if Mongo couldn't be reached, otherwise None.
+    """
+    try:
+        try:
+            # partial: entries written before query_hash existed (possibly duplicated) are left to the TTL
+            market_cache.create_index(
+                [("query_hash", 1)],
+                unique=True,
+                partialFilterExpression={"query_hash": {"$exists": True}}
+            )
+        except OperationFailure:
+            # lookups still work without uniqueness; upserts keep new entries from duplicating
+            pass
+        market_cache.create_index([("fetched_at", 1)], expireAfterSeconds=MARKET_CACHE_TTL_SECONDS)
+        # backs the archive's newest-first sort and (created_at, _id) pagination
+        debates_collection.create_index([("created_at", DESCENDING), ("_id", DESCENDING)])
+    except Exception as e:
+        return str(e)
+    return None
+
+@st.cache_resource
+def init_indexes():
+    """
+    Build the indexes once per process on the background executor, so cold starts never wait on Atlas.
+    Returns the future; the sidebar reports (and clears, to retry) a failed build.
+    """
+    return get_background_executor().submit(create_indexes)
+
+init_indexes()
+
 # ---------------------------
-# RAG: fetch market data using Tavily
+# Helpers: Mongo health check
 # ---------------------------
-def fetch_market_trends(query: str, max_results: int = 5) -> str:
+# a healthy result is re-checked after this long; a failed one is retried on every check
+MONGO_HEALTH_TTL_SECONDS = 30
+
+@st.cache_resource
+def get_mongo_health():
+    # process-wide status: "ok" stays None until the first ping finishes
+    return {"ok": None, "checked_at": None, "future": None, "lock": threading.Lock()}
+
+def ping_mongo(health):
+    try:
+        mongo_client.admin.command("ping")
+        ok = True
+    except Exception:
+        ok = False
+    # timestamp first: check_mongo_health reads checked_at whenever ok is truthy
+    health["checked_at"] = time.monotonic()
+    health["ok"] = ok
+
+def check_mongo_health():
     """
-    Query Tavily API and return concatenated snippets.
-    Caches results in Mongo to avoid repeated queries.
-    (No fallback stubbing — if API fails, we return empty or an error string.)
+    Start a background ping unless a fresh successful result exists or one is already in flight,
+    and return the status dict as last known — page renders never wait on the ping.
+    """
+    health = get_mongo_health()
+    with health["lock"]:
+        fresh = (
+            health["ok"]
+            and time.monotonic() - health["checked_at"] < MONGO_HEALTH_TTL_SECONDS
+        )
+        in_flight = health["future"] is not None and not health["future"].done()
+        if not fresh and not in_flight:
+            health["future"] = get_background_executor().submit(ping_mongo, health)
+    return health
+
+check_mongo_health()
+
+# ---------------------------
+# Helpers: buffered market_cache writes
+# ---------------------------
+CACHE_FLUSH_BATCH_SIZE = 16
+CACHE_FLUSH_INTERVAL_SECONDS = 2.0
+
+class CacheWriteBuffer:
+    """
+    Collects market_cache upserts and writes them with a single unordered bulk_write,
+    once `batch_size` ops are pending or `interval` seconds after the first pending op.
     """
-    if not TAVILY_API_KEY:
-        return "⚠️ TAVILY_API_KEY missing in .env — cannot fetch market data."
 
-    # simple cache by exact query
-    cached = market_cache.find_one({"query": query})
+    def __init__(self, collection, batch_size: int, interval: float):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.interval = interval
+        self._ops = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, op):
+        with self._lock:
+            self._ops.append(op)
+            flush_now = len(self._ops) >= self.batch_size
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            ops, self._ops = self._ops, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not ops:
+            return
+        try:
+            self.collection.bulk_write(ops, ordered=False)
+        except Exception:
+            # cache writes are best-effort; a lost entry just means another Tavily call later
+            pass
+
+@st.cache_resource
+def get_cache_write_buffer():
+    return CacheWriteBuffer(market_cache, CACHE_FLUSH_BATCH_SIZE, CACHE_FLUSH_INTERVAL_SECONDS)
+
+# ---------------------------
+# RAG: fetch market data using Tavily
+# ---------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_market_trends_cached(query: str, max_results: int) -> str:
+    """
+    Mongo cache lookup, falling back to Tavily on a miss.
+    Raises on failure so that error strings are never memoized by st.cache_data.
+    """
+    # cache by exact query digest (unique index; stale entries expire via TTL index)
+    query_hash = market_cache_key(query)
+    cached = market_cache.find_one({"query_hash": query_hash})
     if cached:
-        # Return cached results (assume freshness OK — can add TTL logic later)
         return cached.get("results", "")
 
-    try:
-        resp = requests.post(
-            "https://api.tavily.com/search",
-            headers={"Authorization": f"Bearer {TAVILY_API_KEY}"},
-            json={"query": query, "num_results": max_results},
-            timeout=15
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        results = [item.get("content", "") for item in data.get("results", []) if item.get("content")]
-        combined = "\n\n".join(results[:max_results])
-
-        # cache into mongo
-        market_cache.insert_one({
+    resp = get_http_session().post(
+        "https://api.tavily.com/search",
+        json={"query": query, "num_results": max_results},
+        timeout=15
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    contents = (item.get("content") for item in data.get("results", []))
+    combined = "\n\n".join(islice((c for c in contents if c), max_results))
+
+    # cache into mongo (buffered upsert so concurrent misses don't hit duplicate-key errors)
+    get_cache_write_buffer().add(UpdateOne(
+        {"query_hash": query_hash},
+        {"$set": {
             "query": query,
             "results": combined,
             "fetched_at": datetime.datetime.now(datetime.timezone.utc)
-        })
+        }},
+        upsert=True
+    ))
+
+    return combined
+
+def fetch_market_trends(query: str, max_results: int = 5) -> str:
+    """
+    Query Tavily API and return concatenated snippets.
+    Results are cached in process memory (1h) on top of the Mongo cache to avoid repeated queries.
+    (No fallback stubbing — if API fails, we return empty or an error string.)
+    """
+    if not TAVILY_API_KEY:
+        return "⚠️ TAVILY_API_KEY missing in .env — cannot fetch market data."
 
-        return combined
+    try:
+        return _fetch_market_trends_cached(query, max_results)
     except Exception as e:
         # bubble up a useful error string (no stubbing)
         return f"Error fetching market data: {e}"
 
+def market_search_query(idea: str) -> str:
+    return f"Recent market trends, competitors, pricing, funding signals for: {idea}"
+
 # ---------------------------
 # Streaming wrapper for Gemini generate_content
 # ---------------------------
 def stream_response_generator(prompt: str):
     """
-    Yield streaming chunks from Gemini's generate_content.
+    Return a generator of streaming chunks from Gemini's generate_content.
     Each yielded string should be displayed incrementally.
     """
+    # resolve the model here, on the script thread; the chunks may be pulled from a worker thread
+    model = init_gemini()
+
+    def chunks():
+        try:
+            stream = model.generate_content(prompt, stream=True)
+            for chunk in stream:
+                # chunk may have .text attribute containing partial text
+                if getattr(chunk, "text", None):
+                    yield chunk.text
+        except Exception as e:
+            yield f"[Model Error] {e}"
+
+    return chunks()
+
+# minimum time between placeholder re-renders while streaming (each render resends the whole text)
+STREAM_RENDER_INTERVAL_SECONDS = 0.05
+
+def render_stream(gen, placeholder) -> str:
+    """
+    Render a response generator into a placeholder as it streams; returns the full text.
+    Re-renders are throttled to STREAM_RENDER_INTERVAL_SECONDS, with a final render at the end.
+    """
+    parts = []
+    last_render = time.monotonic()
+    for chunk in gen:
+        parts.append(chunk)
+        now = time.monotonic()
+        if now - last_render >= STREAM_RENDER_INTERVAL_SECONDS:
+            placeholder.markdown("".join(parts))
+            last_render = now
+    text = "".join(parts)
+    placeholder.markdown(text)
+    return text
+
+def stream_in_parallel(streams):
+    """
+    Drain several response generators concurrently and render each into its own placeholder.
+    `streams` is a list of (generator, placeholder) pairs; returns the full texts in the same order.
+    Worker threads only pull chunks — all Streamlit calls stay on the script thread.
+    If the run is stopped mid-stream, workers quit at their next chunk instead of reading to the end.
+    """
+    chunks = queue.Queue()
+    stop = threading.Event()
+
+    def drain(idx, gen):
+        try:
+            for chunk in gen:
+                if stop.is_set():
+                    break
+                chunks.put((idx, chunk))
+        finally:
+            gen.close()
+            chunks.put((idx, None))
+
+    parts = [[] for _ in streams]
+    rendered = [0] * len(streams)
+    last_render = [time.monotonic()] * len(streams)
+
+    def render(idx):
+        streams[idx][1].markdown("".join(parts[idx]))
+        rendered[idx] = len(parts[idx])
+        last_render[idx] = time.monotonic()
+
+    executor = ThreadPoolExecutor(max_workers=len(streams))
     try:
-        stream = gemini_model.generate_content(prompt, stream=True)
-        buffer = ""
-        for chunk in stream:
-            # chunk may have .text attribute containing partial text
-            if getattr(chunk, "text", None):
-                buffer += chunk.text
-                yield chunk.text
-        # (optionally) yield a marker or final buffer at end
-    except Exception as e:
-        yield f"[Model Error] {e}"
+        for idx, (gen, _) in enumerate(streams):
+            executor.submit(drain, idx, gen)
+
+        remaining = len(streams)
+        while remaining:
+            try:
+                idx, chunk = chunks.get(timeout=STREAM_RENDER_INTERVAL_SECONDS)
+            except queue.Empty:
+                # no new chunk: flush text held back by the throttle
+                for idx in range(len(streams)):
+                    if rendered[idx] < len(parts[idx]):
+                        render(idx)
+                continue
+            if chunk is None:
+                remaining -= 1
+                continue
+            parts[idx].append(chunk)
+            if time.monotonic() - last_render[idx] >= STREAM_RENDER_INTERVAL_SECONDS:
+                render(idx)
+    finally:
+        # on a stopped run (Streamlit raises from a placeholder call) don't wait for the workers
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for idx in range(len(streams)):
+        render(idx)
+    return ["".join(p) for p in parts]
 
 # ---------------------------
 # Clarifying questions
 # ---------------------------
-@st.cache_data
-def generate_clarifying_questions(idea_title: str, idea_desc: str):
-    prompt = f"""
+_CLARIFYING_PROMPT = """
 You are a practical startup mentor. A founder provided this idea:
 Title: {idea_title}
 Description: {idea_desc}
@@ -155,30 +460,37 @@ Generate exactly 3–5 clarifying questions to better understand this idea.
 - Focus on market, target segment, feasibility, differentiation, and execution.
 - Do not add extra text.
 """
+
+@st.cache_data
+def _generate_clarifying_questions_cached(key: str, _idea_title: str, _idea_desc: str):
+    # st.cache_data skips hashing underscore-prefixed args, so only the short `key` is hashed
+    prompt = _CLARIFYING_PROMPT.format(idea_title=_idea_title, idea_desc=_idea_desc)
     try:
-        r = gemini_model.generate_content(prompt)
+        r = init_gemini().generate_content(prompt)
         raw = r.text.strip()
-        # parse numbered lines
-        lines = [line.strip() for line in raw.splitlines() if re.match(r"^\d+\.", line.strip())]
-        return lines if lines else [raw]
+        # parse numbered lines (numbering stripped)
+        questions = _QLINE_RE.findall(raw)
+        return questions if questions else [raw]
     except Exception as e:
         return [f"Error generating questions: {e}"]
 
+def generate_clarifying_questions(idea_title: str, idea_desc: str):
+    """
+    Cached by a blake2b digest of the normalized (stripped, lower-cased) title + description,
+    so near-identical inputs share an entry and long descriptions aren't rehashed on every rerun.
+    """
+    normalized = f"{idea_title.strip().lower()}|{idea_desc.strip().lower()}"
+    key = hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+    return _generate_clarifying_questions_cached(key, idea_title, idea_desc)
+
 # ---------------------------
 # Persona response handler
 # ---------------------------
-def get_agent_response(persona: str, idea: str, last_statement: str = None):
-    """
-    Returns a generator for persona responses.
-    Personas: Optimist, Critic, Evaluator/Business Analyst, Market Analyst, Investor
-    Market Analyst uses RAG data from Tavily.
-    Investor returns structured numeric outputs.
-    """
-    # Market Analyst (RAG)
-    if persona == "Market Analyst":
-        search_query = f"Recent market trends, competitors, pricing, funding signals for: {idea}"
-        market_data = fetch_market_trends(search_query)
-        prompt = f"""
+# prompt templates, built once per process and filled with str.format
+_PERSONA_OPENING_PROMPT = "You are a startup {persona}. Analyze the idea: '{idea}' in 2–3 concise bullet points. Be specific and actionable."
+_PERSONA_REPLY_PROMPT = "You are a startup {persona}. The idea: '{idea}'. The last statement was: '{last_statement}'. Respond directly in 2–3 clear points."
+
+_MARKET_ANALYST_PROMPT = """
 You are a Market Analyst. Use the following retrieved market snippets (RAG) to produce an evidence-backed summary.
 
 Startup Idea:
@@ -192,12 +504,9 @@ Task:
 - Highlight competitor signals, funding/traction notes, market growth or saturation, and GTM/pricing cues.
 - Keep output factual and concise.
 """
-        return stream_response_generator(prompt)
 
-    # Investor persona
-    if persona == "Investor":
-        # structured numeric evaluation
-        prompt = f"""
+# structured numeric evaluation
+_INVESTOR_PROMPT = """
 You are an experienced early-stage investor. Evaluate the following startup idea and provide:
 
 1) Five sub-scores on a 0-10 scale (integers or one decimal) with a one-line justification each:
@@ -230,21 +539,38 @@ Recommendations:
 2. <rec2>
 3. <rec3>
 """
+
+def get_agent_response(persona: str, idea: str, last_statement: str = None, market_data: str = None):
+    """
+    Returns a generator for persona responses.
+    Personas: Optimist, Critic, Evaluator/Business Analyst, Market Analyst, Investor
+    Market Analyst uses RAG data from Tavily (pass `market_data` if it was prefetched).
+    Investor returns structured numeric outputs.
+    """
+    # Market Analyst (RAG)
+    if persona == "Market Analyst":
+        if market_data is None:
+            market_data = fetch_market_trends(market_search_query(idea))
+        prompt = _MARKET_ANALYST_PROMPT.format(idea=idea, market_data=market_data)
+        return stream_response_generator(prompt)
+
+    # Investor persona
+    if persona == "Investor":
+        prompt = _INVESTOR_PROMPT.format(idea=idea)
         return stream_response_generator(prompt)
 
     # Default personas: Optimist, Critic, Business Analyst/Evaluator
     if not last_statement:
-        prompt = f"You are a startup {persona}. Analyze the idea: '{idea}' in 2–3 concise bullet points. Be specific and actionable."
+        prompt = _PERSONA_OPENING_PROMPT.format(persona=persona, idea=idea)
     else:
-        prompt = f"You are a startup {persona}. The idea: '{idea}'. The last statement was: '{last_statement}'. Respond directly in 2–3 clear points."
+        prompt = _PERSONA_REPLY_PROMPT.format(persona=persona, idea=idea, last_statement=last_statement)
 
     return stream_response_generator(prompt)
 
 # ---------------------------
 # Final business analyst summary generator
 # ---------------------------
-def get_summary(idea: str, full_transcript: str):
-    prompt = f"""
+_SUMMARY_PROMPT = """
 You are an expert Business Analyst. Given the following discussion transcript for '{idea}', write:
 
 - A short actionable paragraph (3-4 sentences)
@@ -253,6 +579,9 @@ You are an expert Business Analyst. Given the following discussion transcript fo
 Transcript:
 {full_transcript}
 """
+
+def get_summary(idea: str, full_transcript: str):
+    prompt = _SUMMARY_PROMPT.format(idea=idea, full_transcript=full_transcript)
     return stream_response_generator(prompt)
 
 # ---------------------------
@@ -264,6 +593,10 @@ Transcript:
 def show_new_analysis_page():
     st.title("🚀 New Idea Analysis")
 
+    # warm Gemini (SDK import + one-token call) while the user is typing, not inside the first request
+    if GOOGLE_API_KEY:
+        get_background_executor().submit(init_gemini)
+
     # initialize session state if needed
     if "clarifying_questions" not in st.session_state:
         st.header("Step 1: Describe your startup idea")
@@ -284,30 +617,63 @@ def show_new_analysis_page():
                         st.session_state["idea_title"], 
                         st.session_state["idea_desc"]
                     )
-                st.session_state["answers"] = {}
                 st.rerun()
             else:
                 st.error("Please fill both title and description.")
 
     else:
-        st.header("Step 2: Answer the clarifying questions")
-        for i, q in enumerate(st.session_state["clarifying_questions"], start=1):
-            q_clean = re.sub(r'^\d+\.\s*', '', q)
-            st.session_state["answers"][f"Q{i}"] = st.text_area(f"**{q_clean}**", key=f"q{i}", height=80)
-
-        st.divider()
-        st.header("Step 3: Start the analysis")
-        num_rounds = st.slider("How many rounds should the discussion be?", 1, 5, 3)
-
-        if st.button("Start Analysis", type="primary"):
-            idea_full_context = st.session_state["idea_desc"] + "\n\n---Clarifying Details---\n"
+        # a form so typing answers / moving the slider doesn't rerun the script until submit
+        with st.form("answers_form", border=False):
+            st.header("Step 2: Answer the clarifying questions")
+            # answers live in the widgets' own session-state keys (q1, q2, ...)
             for i, q in enumerate(st.session_state["clarifying_questions"], start=1):
-                q_clean = re.sub(r'^\d+\.\s*', '', q)
-                idea_full_context += f"Q: {q_clean}\nA: {st.session_state['answers'].get(f'Q{i}', 'Not answered.')}\n"
+                st.text_area(f"**{q}**", key=f"q{i}", height=80)
+
+            st.divider()
+            st.header("Step 3: Start the analysis")
+            num_rounds = st.slider("How many rounds should the discussion be?", 1, 5, 3)
+            start_analysis = st.form_submit_button("Start Analysis", type="primary")
+
+        if start_analysis:
+            questions = st.session_state["clarifying_questions"]
+            st.session_state["answers"] = {
+                f"Q{i}": st.session_state.get(f"q{i}", "") for i in range(1, len(questions) + 1)
+            }
+
+            # build the idea context once per analysis; every agent call reuses this string
+            context_parts = [st.session_state["idea_desc"], "\n\n---Clarifying Details---\n"]
+            for i, q in enumerate(questions, start=1):
+                context_parts.append(f"Q: {q}\nA: {st.session_state['answers'].get(f'Q{i}', 'Not answered.')}\n")
+            idea_full_context = "".join(context_parts)
+
+            # prefetch market data so the Tavily round-trip overlaps the debate rounds
+            market_data_future = get_background_executor().submit(
+                fetch_market_trends, market_search_query(idea_full_context)
+            )
+
+            # create the archive document up front and fill it in as each section completes;
+            # writes run in the background so they never block the next agent call
+            debate_id = ObjectId()
+            pending_writes = queue.Queue()
+            save_futures = []
+
+            def save_in_background(op):
+                pending_writes.put(op)
+                save_futures.append(
+                    get_db_writer().submit(flush_pending_writes, debates_writes, pending_writes)
+                )
 
-            # transcript collectors
-            conversation_history_for_db = ""
-            full_transcript_text = ""
+            save_in_background(InsertOne({
+                "_id": debate_id,
+                "idea_title": st.session_state.get("idea_title", "Untitled"),
+                "idea_description": st.session_state.get("idea_desc", ""),
+                "clarifying_answers": st.session_state.get("answers", {}),
+                "status": "running",
+                "created_at": datetime.datetime.now(datetime.timezone.utc)
+            }))
+
+            # transcript collector (one entry per turn, joined once when needed)
+            transcript_parts = []
             last_response = ""
 
             st.subheader("💬 Live Discussion Transcript")
@@ -323,13 +689,9 @@ def show_new_analysis_page():
                     optimist_placeholder = st.empty()
                     with st.spinner("Optimist is thinking..."):
                         optimist_gen = get_agent_response("Optimist", idea_full_context, last_response)
-                        optimist_response = ""
-                        for chunk in optimist_gen:
-                            optimist_response += chunk
-                            optimist_placeholder.markdown(optimist_response)
+                        optimist_response = render_stream(optimist_gen, optimist_placeholder)
 
-                    conversation_history_for_db += f"\nRound {round_no} - Optimist: {optimist_response}"
-                    full_transcript_text += f"\nRound {round_no} - Optimist: {optimist_response}"
+                    transcript_parts.append(f"Round {round_no} - Optimist: {optimist_response}")
                     last_response = optimist_response
 
                     st.divider()
@@ -339,110 +701,202 @@ def show_new_analysis_page():
                     critic_placeholder = st.empty()
                     with st.spinner("Critic is thinking..."):
                         critic_gen = get_agent_response("Critic", idea_full_context, last_response)
-                        critic_response = ""
-                        for chunk in critic_gen:
-                            critic_response += chunk
-                            critic_placeholder.markdown(critic_response)
-
-                    conversation_history_for_db += f"\nRound {round_no} - Critic: {critic_response}"
-                    full_transcript_text += f"\nRound {round_no} - Critic: {critic_response}"
+                        critic_response = render_stream(critic_gen, critic_placeholder)
+
+                    transcript_parts.append(f"Round {round_no} - Critic: {critic_response}")
+                    save_in_background(UpdateOne({"_id": debate_id}, {"$push": {"rounds": {
+                        "round": round_no,
+                        "optimist": optimist_response,
+                        "critic": critic_response
+                    }}}))
                     last_response = critic_response
 
-            # After rounds — final business analyst summary
+            # After rounds — final business analyst summary, Market Analyst and Investor Bot.
+            # Only the summary needs the transcript; the other two work from the idea context,
+            # so all three stream concurrently instead of waiting on each other.
             st.divider()
             st.subheader("--- Final Business Analyst Summary ---")
             summary_placeholder = st.empty()
-            with st.spinner("Drafting the final summary..."):
-                summary_gen = get_summary(idea_full_context, full_transcript_text)
-                final_summary = ""
-                for chunk in summary_gen:
-                    final_summary += chunk
-                    summary_placeholder.markdown(final_summary)
-
-            conversation_history_for_db += f"\nFinal Summary: {final_summary}"
-            full_transcript_text += f"\nFinal Summary: {final_summary}"
-            last_response = final_summary
-
-            # MARKET ANALYST (runs AFTER final summary)
             st.divider()
             st.subheader("🌍 Market Analyst (RAG-powered) — Evidence-backed insight")
             market_placeholder = st.empty()
-            with st.spinner("Fetching market data and producing market analyst insight..."):
-                market_gen = get_agent_response("Market Analyst", idea_full_context, last_response)
-                market_insight = ""
-                for chunk in market_gen:
-                    market_insight += chunk
-                    market_placeholder.markdown(market_insight)
-
-            conversation_history_for_db += f"\nMarket Analyst: {market_insight}"
-            full_transcript_text += f"\nMarket Analyst: {market_insight}"
-            last_response = market_insight
-
-            # INVESTOR BOT
             st.divider()
             st.subheader("💼 Investor Bot — Investment Score & Recommendations")
             investor_placeholder = st.empty()
-            with st.spinner("Investor Bot is evaluating the idea..."):
-                investor_gen = get_agent_response(
-                    "Investor", 
-                    idea_full_context + "\n\nMarket Analyst insight:\n" + market_insight, 
-                    last_response
+            with st.spinner("Drafting the final summary, fetching market data and evaluating the idea..."):
+                summary_gen = get_summary(idea_full_context, "\n".join(transcript_parts))
+                market_gen = get_agent_response(
+                    "Market Analyst", idea_full_context,
+                    market_data=market_data_future.result()
                 )
-                investor_output = ""
-                for chunk in investor_gen:
-                    investor_output += chunk
-                    investor_placeholder.markdown(investor_output)
-
-            conversation_history_for_db += f"\nInvestor Bot: {investor_output}"
-            full_transcript_text += f"\nInvestor Bot: {investor_output}"
-
-            # Save to MongoDB
+                investor_gen = get_agent_response("Investor", idea_full_context)
+                final_summary, market_insight, investor_output = stream_in_parallel([
+                    (summary_gen, summary_placeholder),
+                    (market_gen, market_placeholder),
+                    (investor_gen, investor_placeholder),
+                ])
+
+            # rounds are already stored; the archive rebuilds the transcript from them on read
+            save_in_background(UpdateOne({"_id": debate_id}, {"$set": {
+                "final_summary": final_summary,
+                "market_insight": market_insight,
+                "investor_output": investor_output,
+                "status": "complete"
+            }}))
+
+            # wait for the queued writes so the confirmation reflects what is actually stored
             try:
-                doc = {
-                    "idea_title": st.session_state.get("idea_title", "Untitled"),
-                    "idea_description": st.session_state.get("idea_desc", ""),
-                    "clarifying_answers": st.session_state.get("answers", {}),
-                    "debate_transcript": conversation_history_for_db.strip(),
-                    "final_summary": final_summary,
-                    "market_insight": market_insight,
-                    "investor_output": investor_output,
-                    "created_at": datetime.datetime.now(datetime.timezone.utc)
-                }
-                res = debates_collection.insert_one(doc)
-                st.success(f"💾 Analysis saved! Document ID: {res.inserted_id}")
+                for future in save_futures:
+                    future.result()
+                st.success(f"💾 Analysis saved! Document ID: {debate_id}")
+                # refresh the cached archive views so the new analysis shows up immediately
+                load_history_page.clear()
+                get_debate_by_id.clear()
+                get_total_analyses.clear()
             except Exception as e:
                 st.error(f"Failed to save to DB: {e}")
 
 # ---------------------------
 # UI: History Page
 # ---------------------------
-def show_analysis_history_page(all_analyses):
+@st.cache_data(ttl=30, show_spinner=False)
+def get_total_analyses() -> int:
+    # metadata-based count: O(1) and good enough for the sidebar metric and page count
+    return debates_collection.estimated_document_count()
+
+HISTORY_PAGE_SIZE = 50
+# fields needed to render the archive list; the heavy ones are loaded per analysis on demand
+HISTORY_LIST_FIELDS = {"idea_title": 1, "created_at": 1, "final_summary": 1, "status": 1}
+HISTORY_DETAIL_FIELDS = {
+    "idea_title": 1, "created_at": 1, "final_summary": 1, "market_insight": 1, "investor_output": 1, "rounds": 1, "debate_transcript": 1
+}
+
+def build_debate_transcript(doc) -> str:
+    """
+    Full transcript of an archived analysis.
+    Older documents store it as one string; incrementally saved ones keep the per-round turns
+    and the final sections separately, so the transcript is assembled from those.
+    """
+    if doc.get("debate_transcript"):
+        return doc["debate_transcript"]
+    lines = []
+    for r in doc.get("rounds", []):
+        lines.append(f"Round {r['round']} - Optimist: {r['optimist']}")
+        lines.append(f"Round {r['round']} - Critic: {r['critic']}")
+    for label, field in (("Final Summary", "final_summary"), ("Market Analyst", "market_insight"), ("Investor Bot", "investor_output")):
+        if doc.get(field):
+            lines.append(f"{label}: {doc[field]}")
+    return "\n".join(lines)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_history_page(before=None):
+    """
+    One page of the archive list, newest first, with list fields only.
+    Keyset pagination: the page starts strictly after the `before` (created_at, _id) cursor
+    (None = newest); _id breaks ties between analyses saved with the same timestamp.
+    Cleared after a new analysis is saved.
+    """
+    if before is None:
+        query = {}
+    else:
+        created_at, debate_id = before
+        query = {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": debate_id}},
+        ]}
+    return list(
+        debates_collection.find(query, HISTORY_LIST_FIELDS)
+        .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+        .limit(HISTORY_PAGE_SIZE)
+    )
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_debate_by_id(debate_id: str):
+    # direct _id lookup for one analysis' heavy fields; an analysis still being saved
+    # incrementally may be cached part-way, so this is cleared whenever an analysis completes
+    return debates_collection.find_one({"_id": ObjectId(debate_id)}, HISTORY_DETAIL_FIELDS) or {}
+
+def show_analysis_history_page():
     st.title("📚 Analysis Archive")
-    if not all_analyses:
+    total = get_total_analyses()
+    if not total:
         st.warning("Your archive is empty.")
         return
 
     st.divider()
-    total = len(all_analyses)
-    latest = all_analyses[0]["created_at"] if total > 0 else None
+    first_page = load_history_page()
     c1, c2 = st.columns(2)
     c1.metric("Total Analyses", total)
-    if latest:
-        c2.metric("Most Recent", latest.strftime("%B %d, %Y at %I:%M %p"))
+    if first_page:
+        c2.metric("Most Recent", first_page[0]["created_at"].strftime("%B %d, %Y at %I:%M %p"))
     st.divider()
+    archive_list()
+
+@st.fragment
+def archive_list():
+    """
+    Archive table + "Load more" + the selected report; selecting or paging reruns only this fragment.
+    """
+    # (created_at, _id) of the last analysis of each loaded page; "Load more" appends a cursor
+    cursors = st.session_state.setdefault("history_cursors", [None])
+    analyses = []
+    last_page = []
+    for before in cursors:
+        last_page = load_history_page(before)
+        analyses.extend(last_page)
+
+    # one dataframe widget instead of a widget per analysis;
+    # status stays "running" until an analysis' final write: it is either still in progress
+    # (possibly in another session) or was interrupted before it finished
+    table = {
+        "Title": [
+            a.get("idea_title", "Untitled") + (" (not finished)" if a.get("status") == "running" else "")
+            for a in analyses
+        ],
+        "Created": [a["created_at"].strftime("%b %d, %Y") for a in analyses],
+        "Summary": [(a.get("final_summary") or "")[:200] for a in analyses],
+        "id": [str(a["_id"]) for a in analyses],
+    }
+    event = st.dataframe(
+        table,
+        key="archive_table",
+        on_select="rerun",
+        selection_mode="single-row",
+        hide_index=True,
+        column_order=["Title", "Created", "Summary"]
+    )
+
+    if len(last_page) == HISTORY_PAGE_SIZE and st.button("Load more"):
+        cursors.append((last_page[-1]["created_at"], last_page[-1]["_id"]))
+        st.rerun(scope="fragment")
+
+    # the selection holds row positions, which shift once a cache refresh reorders the list;
+    # resolve the _id only when the selection itself changes and render from that
+    selected_rows = tuple(event.selection.rows)
+    if selected_rows != st.session_state.get("archive_selected_rows"):
+        st.session_state["archive_selected_rows"] = selected_rows
+        if selected_rows:
+            st.session_state["selected_debate_id"] = table["id"][selected_rows[0]]
+        else:
+            st.session_state.pop("selected_debate_id", None)
+
+    debate_id = st.session_state.get("selected_debate_id")
+    details = get_debate_by_id(debate_id) if debate_id else {}
+    if not details:
+        st.caption("Select an analysis to view its full report.")
+        return
 
-    for analysis in all_analyses:
-        with st.expander(f"{analysis.get('idea_title','Untitled')} — {analysis.get('created_at').strftime('%b %d, %Y')}"):
-            st.markdown(f"**Title:** {analysis.get('idea_title')}")
-            st.markdown(f"**Created at:** {analysis.get('created_at').strftime('%B %d, %Y at %I:%M %p')}")
-            st.markdown("**Final Summary:**")
-            st.write(analysis.get("final_summary", ""))
-            st.markdown("**Market Insight:**")
-            st.write(analysis.get("market_insight", ""))
-            st.markdown("**Investor Output:**")
-            st.write(analysis.get("investor_output", ""))
-            with st.expander("Full Debate Transcript"):
-                st.text(analysis.get("debate_transcript", ""))
+    st.divider()
+    st.markdown(f"**Title:** {details.get('idea_title')}")
+    st.markdown(f"**Created at:** {details['created_at'].strftime('%B %d, %Y at %I:%M %p')}")
+    st.markdown("**Final Summary:**")
+    st.write(details.get("final_summary", ""))
+    st.markdown("**Market Insight:**")
+    st.write(details.get("market_insight", ""))
+    st.markdown("**Investor Output:**")
+    st.write(details.get("investor_output", ""))
+    with st.expander("Full Debate Transcript"):
+        st.text(build_debate_transcript(details))
 
 # ---------------------------
 # Sidebar & Routing
@@ -452,23 +906,41 @@ st.sidebar.divider()
 pages = ["New Analysis", "Analysis History"]
 def on_page_change():
     if st.session_state.get("radio_nav") == "New Analysis":
-        for key in ["clarifying_questions", "idea_title", "idea_desc", "answers", "selected_debate_id"]:
+        for key in ["clarifying_questions", "idea_title", "idea_desc", "answers", "selected_debate_id", "archive_selected_rows", "history_cursors"]:
             if key in st.session_state:
                 del st.session_state[key]
 
 selected = st.sidebar.radio("Main Menu", pages, key="radio_nav", on_change=on_page_change, label_visibility="collapsed")
 st.sidebar.divider()
 st.sidebar.subheader("App Status")
-try:
-    total_docs = debates_collection.count_documents({})
-    st.sidebar.metric("Saved Analyses", total_docs)
-    st.sidebar.success("✅ MongoDB connected")
-except Exception:
-    st.sidebar.error("DB connection error")
+
+@st.fragment(run_every=30)
+def sidebar_stats():
+    # refreshes on its own timer without rerunning the rest of the app
+    index_future = init_indexes()
+    if index_future.done() and index_future.result():
+        st.warning(f"Index setup failed: {index_future.result()}")
+        # retried on the next rerun
+        init_indexes.clear()
+    try:
+        st.metric("Saved Analyses", get_total_analyses())
+    except Exception:
+        st.error("DB connection error")
+        return
+    # last known status; a ping started here is picked up on the next tick
+    mongo_ok = check_mongo_health()["ok"]
+    if mongo_ok is None:
+        st.info("⏳ Checking MongoDB connection...")
+    elif mongo_ok:
+        st.success("✅ MongoDB connected")
+    else:
+        st.error("DB connection error")
+
+with st.sidebar:
+    sidebar_stats()
 
 # Routing
 if selected == "New Analysis":
     show_new_analysis_page()
 else:
-    all_docs = list(debates_collection.find().sort("created_at", DESCENDING))
-    show_analysis_history_page(all_docs)
+    show_analysis_history_page()